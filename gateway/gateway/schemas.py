@@ -21,6 +21,20 @@ class ProductSchema(Schema):
     passenger_capacity = fields.Int(required=True)
 
 
+class DictProductSchema(ProductSchema):
+    """``ProductSchema`` specialised for the plain-dict payloads the
+    gateway receives over RPC.
+
+    marshmallow's default accessor probes attribute access before item
+    access for every field; when the input is known to be a dict, a
+    direct item lookup is substantially cheaper on dump.
+    """
+
+    get_attribute = staticmethod(
+        lambda attr, obj, default: obj.get(attr, default)
+    )
+
+
 class GetOrderSchema(Schema):
 
     class OrderDetail(Schema):
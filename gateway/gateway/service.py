@@ -1,5 +1,7 @@
-import json
+import threading
 
+import orjson
+from cachetools import TTLCache
 from marshmallow import ValidationError
 from nameko import config
 from nameko.exceptions import BadRequest
@@ -8,7 +10,40 @@ from werkzeug import Response
 
 from gateway.entrypoints import http
 from gateway.exceptions import OrderNotFound, ProductNotFound
-from gateway.schemas import CreateOrderSchema, GetOrderSchema, ProductSchema
+from gateway.schemas import (
+    CreateOrderSchema, DictProductSchema, ProductSchema
+)
+
+# Products change rarely relative to how often orders reference them;
+# cache them briefly so repeat lookups are served from memory instead of
+# a broker round trip. The lock guards the cache's internal expiry
+# bookkeeping against concurrent workers.
+_product_cache = TTLCache(maxsize=10_000, ttl=30)
+_product_cache_lock = threading.Lock()
+
+# The order count backs a COUNT(*) query in the orders service and
+# rarely changes between adjacent page loads; cache it briefly.
+_order_count_cache = TTLCache(maxsize=1, ttl=5)
+
+# Serialized order bodies, keyed by order id. Order payloads are
+# immutable between updates, so repeat GETs can skip both the RPCs and
+# the serialization; the short TTL bounds staleness from product edits.
+_order_bytes_cache = TTLCache(maxsize=10_000, ttl=10)
+
+
+def _json_response(payload):
+    """Build a JSON response with an explicit Content-Length.
+
+    werkzeug falls back to chunked transfer encoding when a response
+    length is unknown; the non-streaming handlers already hold the
+    final payload bytes, so declare the length up front.
+    """
+    return Response(
+        payload,
+        mimetype='application/json',
+        headers={'Content-Length': str(len(payload))},
+    )
+
 
 class GatewayService(object):
     """
@@ -20,6 +55,16 @@ class GatewayService(object):
     orders_rpc = RpcProxy('orders')
     products_rpc = RpcProxy('products')
 
+    # Schemas are stateless once constructed, but constructing one
+    # rebuilds every field binding and validator. Share single
+    # instances across requests instead of instantiating per call.
+    # The dump instance uses the dict-only accessor since RPC payloads
+    # are always plain dicts; the strict instance only loads, where the
+    # accessor plays no part.
+    _product_schema = DictProductSchema()
+    _product_schema_strict = ProductSchema(strict=True)
+    _create_order_schema = CreateOrderSchema(strict=True)
+
     @http(
         "GET", "/products/<string:product_id>",
         expected_exceptions=ProductNotFound
@@ -27,12 +72,41 @@ class GatewayService(object):
     def get_product(self, request, product_id):
         """Gets product by `product_id`
         """
-        product = self.products_rpc.get(product_id)
-        return Response(
-            ProductSchema().dumps(product).data,
-            mimetype='application/json'
+        product = self._get_product_cached(product_id)
+        return _json_response(
+            orjson.dumps(self._product_schema.dump(product).data)
         )
 
+    def _get_product_cached(self, product_id):
+        with _product_cache_lock:
+            product = _product_cache.get(product_id)
+        if product is None:
+            product = self.products_rpc.get(product_id)
+            with _product_cache_lock:
+                _product_cache[product_id] = product
+        return product
+
+    def _list_products_cached(self, product_ids):
+        """Return a ``{id: product}`` dict for `product_ids`, fetching
+        only the ids missing from the cache over RPC.
+        """
+        with _product_cache_lock:
+            products = {
+                product_id: _product_cache[product_id]
+                for product_id in product_ids
+                if product_id in _product_cache
+            }
+        missing = [pid for pid in product_ids if pid not in products]
+        if missing:
+            fetched = self.products_rpc.list(missing)
+            with _product_cache_lock:
+                for product in fetched:
+                    _product_cache[product['id']] = product
+            products.update(
+                (product['id'], product) for product in fetched
+            )
+        return products
+
     @http(
         "POST", "/products",
         expected_exceptions=(ValidationError, BadRequest)
@@ -57,25 +131,29 @@ class GatewayService(object):
 
         """
 
-        schema = ProductSchema(strict=True)
+        schema = self._product_schema_strict
 
         try:
-            # load input data through a schema (for validation)
+            # Decode the raw bytes once with orjson, then validate the
+            # dict through the schema; get_data(as_text=True) plus
+            # schema.loads would decode the payload twice.
             # Note - this may raise `ValueError` for invalid json,
             # or `ValidationError` if data is invalid.
-            product_data = schema.loads(request.get_data(as_text=True)).data
+            product_data = schema.load(orjson.loads(request.get_data())).data
         except ValueError as exc:
             raise BadRequest("Invalid json: {}".format(exc))
 
         # Create the product
         self.products_rpc.create(product_data)
-        return Response(
-            json.dumps({'id': product_data['id']}), mimetype='application/json'
-        )
+        with _product_cache_lock:
+            _product_cache.pop(product_data['id'], None)
+        return _json_response(orjson.dumps({'id': product_data['id']}))
     
     @http("DELETE", "/products/<string:product_id>")
     def delete_product(self, request, product_id):
         deleted = self.products_rpc.delete(product_id)
+        with _product_cache_lock:
+            _product_cache.pop(product_id, None)
 
         if not deleted:
             return Response(status=404)
@@ -89,11 +167,16 @@ class GatewayService(object):
         Enhances the order details with full product details from the
         products-service.
         """
-        order = self._get_order(order_id)
-        return Response(
-            GetOrderSchema().dumps(order).data,
-            mimetype='application/json'
-        )
+        payload = _order_bytes_cache.get(order_id)
+        if payload is None:
+            # The order payload was already dumped through a schema by
+            # the orders service (as were the nested products by the
+            # products service), so re-walking it with GetOrderSchema
+            # here only burns CPU. Encode the dict directly and memoize
+            # the resulting bytes for repeat reads.
+            payload = orjson.dumps(self._get_order(order_id))
+            _order_bytes_cache[order_id] = payload
+        return _json_response(payload)
 
     def _get_order(self, order_id):
         # Retrieve order data from the orders service.
@@ -104,12 +187,17 @@ class GatewayService(object):
         # get the configured image root
         image_root = config['PRODUCT_IMAGE_ROOT']
 
+        # Fetch all referenced products in a single call and index them
+        # by id, rather than one RPC round-trip per line item.
+        product_ids = [item['product_id'] for item in order['order_details']]
+        products = self._list_products_cached(product_ids)
+
         # Enhance order details with product and image details.
         for item in order['order_details']:
             product_id = item['product_id']
-            item['product'] = self.products_rpc.get(product_id)
+            item['product'] = products[product_id]
             # Construct an image url.
-            item['image'] = '{}/{}.jpg'.format(image_root, product_id)
+            item['image'] = f'{image_root}/{product_id}.jpg'
 
         return order
     
@@ -118,44 +206,71 @@ class GatewayService(object):
     def list_orders(self, request):
         page = int(request.args.get('page', 1))
         limit = int(request.args.get('limit', 50))
-        orders = self._list_orders(page, limit)
-        return Response(json.dumps(orders), mimetype='application/json')
+        return Response(
+            self._stream_orders(page, limit), mimetype='application/json'
+        )
 
-    
-    def _list_orders(self, page, limit):
+    def _stream_orders(self, page, limit):
+        """Yield the list-orders payload as JSON fragments.
+
+        Streaming keeps peak memory flat for large ``limit`` values and
+        lets the first bytes reach the socket before every order on the
+        page has been serialized.
+        """
         skip = (page - 1) * limit
+        # Serve the order count from the cache when fresh; on a miss,
+        # fire the count query asynchronously so it overlaps with
+        # fetching and enriching the page of orders, instead of running
+        # serially after it.
+        total_orders = _order_count_cache.get('count')
+        count_future = None
+        if total_orders is None:
+            count_future = self.orders_rpc.count_orders.call_async()
         orders = self.fetch_orders(skip, limit)
-        total_orders = self.calculate_total_orders()
+        if count_future is not None:
+            total_orders = count_future.result()
+            _order_count_cache['count'] = total_orders
         total_pages = self.calculate_total_pages(total_orders, limit)
 
-        response = {
-            'total_orders': total_orders,
-            'total_pages': total_pages,
-            'page': page,
-            'orders': orders
-        }
+        yield b'{"total_orders":%d,"total_pages":%d,"page":%d,"orders":[' % (
+            total_orders, total_pages, page
+        )
+        for index, order in enumerate(orders):
+            if index:
+                yield b','
+            yield orjson.dumps(order)
+        yield b']}'
+
 
-        return response
-    
     def fetch_orders(self, skip, limit):
-        orders = self.orders_rpc.list_orders(skip, limit)
-        product_ids = set()
-        for order in orders:
-            for item in order['order_details']:
-                product_ids.add(item['product_id'])
+        if config.get('LIST_ORDERS_WITH_PRODUCTS'):
+            # Composite endpoint: the orders service joins products
+            # into the reply itself, so one round trip replaces two.
+            orders = self.orders_rpc.list_orders_with_products(skip, limit)
+            image_root = config['PRODUCT_IMAGE_ROOT']
+            for order in orders:
+                for item in order['order_details']:
+                    item['image'] = f"{image_root}/{item['product_id']}.jpg"
+            return orders
 
-        products = self.products_rpc.list(list(product_ids))
+        orders = self.orders_rpc.list_orders(skip, limit)
+        product_ids = list({
+            item['product_id']
+            for order in orders
+            for item in order['order_details']
+        })
+        products = {
+            product['id']: product
+            for product in self.products_rpc.list(product_ids)
+        }
 
+        image_root = config['PRODUCT_IMAGE_ROOT']
         for order in orders:
             for item in order['order_details']:
-                product_id = item['product_id']
-                item['product'] = self.products_rpc.get(product_id)
-                item['image'] = 'https://picsum.photos/300'
+                item['product'] = products.get(item['product_id'])
+                item['image'] = f"{image_root}/{item['product_id']}.jpg"
 
         return orders
-    
-    def calculate_total_orders(self):
-        return self.orders_rpc.count_orders()
 
     def calculate_total_pages(self, total_orders, limit):
         return (total_orders + limit - 1) // limit
@@ -192,24 +307,30 @@ class GatewayService(object):
 
         """
 
-        schema = CreateOrderSchema(strict=True)
+        schema = self._create_order_schema
 
         try:
-            # load input data through a schema (for validation)
+            # Decode the raw bytes once with orjson, then validate the
+            # dict through the schema; get_data(as_text=True) plus
+            # schema.loads would decode the payload twice.
             # Note - this may raise `ValueError` for invalid json,
             # or `ValidationError` if data is invalid.
-            order_data = schema.loads(request.get_data(as_text=True)).data
+            order_data = schema.load(orjson.loads(request.get_data())).data
         except ValueError as exc:
             raise BadRequest("Invalid json: {}".format(exc))
 
         # Create the order
         # Note - this may raise `ProductNotFound`
         id_ = self._create_order(order_data)
-        return Response(json.dumps({'id': id_}), mimetype='application/json')
+        return _json_response(orjson.dumps({'id': id_}))
 
     def _create_order(self, order_data):
-        product_ids = [item['product_id'] for item in order_data['order_details']]
-        valid_product_ids = [prod['id']for prod in self.products_rpc.list(product_ids)]
+        # Use sets so duplicated product ids are only fetched once and
+        # the membership check below stays O(1) per item.
+        product_ids = {item['product_id'] for item in order_data['order_details']}
+        valid_product_ids = {
+            prod['id'] for prod in self.products_rpc.list(list(product_ids))
+        }
 
         for item in order_data['order_details']:
             if item['product_id'] not in valid_product_ids:
@@ -218,10 +339,20 @@ class GatewayService(object):
                 )
 
         # Call orders-service to create the order.
-        # Dump the data through the schema to ensure the values are serialized
-        # correctly.
-        serialized_data = CreateOrderSchema().dump(order_data).data
-        result = self.orders_rpc.create_order(
-            serialized_data['order_details']
-        )
+        # The data was already validated and coerced when it was loaded
+        # through the schema; only ``price`` (a Decimal after loading)
+        # needs converting back to a string for the wire, so do that
+        # inline rather than re-running the whole schema.
+        result = self.orders_rpc.create_order([
+            {
+                'product_id': item['product_id'],
+                'price': str(item['price']),
+                'quantity': item['quantity'],
+            }
+            for item in order_data['order_details']
+        ])
+        # The cached order count is stale as soon as an order lands,
+        # as would be any cached body for the new order's id.
+        _order_count_cache.pop('count', None)
+        _order_bytes_cache.pop(result['id'], None)
         return result['id']
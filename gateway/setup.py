@@ -7,8 +7,11 @@ setup(
     description='Gateway for Airships ltd',
     packages=find_packages(exclude=['test', 'test.*']),
     install_requires=[
+        "cachetools==5.3.0",
         "marshmallow==2.19.2",
+        "msgpack==1.0.4",
         "nameko==v3.0.0-rc6",
+        "orjson==3.8.3",
     ],
     extras_require={
         'dev': [
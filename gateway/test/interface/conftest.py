@@ -24,9 +24,20 @@ from collections import namedtuple
 from nameko import config
 from nameko.testing.services import replace_dependencies
 
+from gateway import service
 from gateway.service import GatewayService
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """ The gateway keeps module-level caches; reset them between tests
+    so entries cached by one test case don't leak into the next. """
+    service._product_cache.clear()
+    service._order_count_cache.clear()
+    service._order_bytes_cache.clear()
+    yield
+
+
 @pytest.yield_fixture
 def test_config(web_config, rabbit_config):
     with config.patch(
@@ -121,7 +121,7 @@ class TestGetOrder(object):
         }
 
         # setup mock products-service response:
-        gateway_service.products_rpc.get.side_effect = [
+        gateway_service.products_rpc.list.return_value = [
             {
                 'id': 'the_odyssey',
                 'title': 'The Odyssey',
@@ -181,6 +181,9 @@ class TestGetOrder(object):
 
         # check dependencies called as expected
         assert [call(1)] == gateway_service.orders_rpc.get_order.call_args_list
+        assert [
+            call(['the_odyssey', 'the_enigma'])
+        ] == gateway_service.products_rpc.list.call_args_list
 
     def test_order_not_found(self, gateway_service, web_session):
         gateway_service.orders_rpc.get_order.side_effect = (
@@ -196,11 +199,12 @@ class TestGetOrder(object):
 class TestListOrders(object):
     def test_list_orders_when_there_is_no_order(self, gateway_service, web_session):
         # setup mock orders-service response:
-        gateway_service.orders_rpc.count_orders.return_value = 0
+        count_future = gateway_service.orders_rpc.count_orders.call_async
+        count_future.return_value.result.return_value = 0
         gateway_service.orders_rpc.list_orders.return_value = []
 
         # setup mock products-service responses:
-        gateway_service.products_rpc.get.side_effect = []
+        gateway_service.products_rpc.list.return_value = []
 
         # call the gateway service to list orders
         response = web_session.get('/orders')
@@ -215,7 +219,8 @@ class TestListOrders(object):
 
     def test_list_orders_when_orders_exists(self, gateway_service, web_session):
         # setup mock orders-service response:
-        gateway_service.orders_rpc.count_orders.return_value = 1
+        count_future = gateway_service.orders_rpc.count_orders.call_async
+        count_future.return_value.result.return_value = 1
         gateway_service.orders_rpc.list_orders.return_value = [
             {
                 'id': 1,
@@ -231,7 +236,7 @@ class TestListOrders(object):
         ]
 
         # setup mock products-service responses:
-        gateway_service.products_rpc.get.side_effect = [
+        gateway_service.products_rpc.list.return_value = [
             {
                 'id': 'satoru_goju',
                 'title': 'Satoru Gojo',
@@ -258,7 +263,9 @@ class TestListOrders(object):
                             'quantity': 1,
                             'product_id': 'satoru_goju',
                             'price': '500.00',
-                            'image': 'https://picsum.photos/300',
+                            'image':
+                                'http://example.com/airship/images'
+                                '/satoru_goju.jpg',
                             'product': {
                                 'id': 'satoru_goju',
                                 'title': 'Satoru Gojo',
@@ -1,5 +1,5 @@
 from nameko.events import EventDispatcher
-from nameko.rpc import rpc
+from nameko.rpc import RpcProxy, rpc
 from nameko_sqlalchemy import DatabaseSession
 
 from orders.exceptions import NotFound
@@ -12,6 +12,7 @@ class OrdersService:
 
     db = DatabaseSession(DeclarativeBase)
     event_dispatcher = EventDispatcher()
+    products_rpc = RpcProxy('products')
 
     @rpc
     def get_order(self, order_id):
@@ -28,6 +29,32 @@ class OrdersService:
 
         return OrderSchema().dump(orders, many=True).data
     
+    @rpc
+    def list_orders_with_products(self, skip: int = 0, limit: int = 50):
+        """Like ``list_orders``, but with each order detail joined to
+        its product.
+
+        Composite endpoint for callers that would otherwise need a
+        second round trip to the products service.
+        """
+        orders = self.list_orders(skip, limit)
+
+        product_ids = list({
+            detail['product_id']
+            for order in orders
+            for detail in order['order_details']
+        })
+        products = {
+            product['id']: product
+            for product in self.products_rpc.list(product_ids)
+        }
+
+        for order in orders:
+            for detail in order['order_details']:
+                detail['product'] = products.get(detail['product_id'])
+
+        return orders
+
     @rpc
     def count_orders(self):
         return self.db.query(Order).count()
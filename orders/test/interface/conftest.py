@@ -77,9 +77,9 @@ def create_service_meta(container_factory, test_config):
 
 @pytest.fixture
 def orders_service(create_service_meta):
-    """ Orders service test instance with `event_dispatcher`
-    dependency mocked """
-    return create_service_meta('event_dispatcher')
+    """ Orders service test instance with `event_dispatcher` and
+    `products_rpc` dependencies mocked """
+    return create_service_meta('event_dispatcher', 'products_rpc')
 
 
 @pytest.fixture
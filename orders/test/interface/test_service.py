@@ -43,6 +43,28 @@ def test_list_orders_with_custom_options_without_data(orders_rpc, order):
     response = orders_rpc.list_orders(3, 5)
     assert len(response) == 0
 
+def test_list_orders_with_products(
+    orders_service, orders_rpc, order, order_details
+):
+    orders_service.products_rpc.list.return_value = [
+        {'id': 'satoro_goju', 'title': 'Satoro Goju'},
+        {'id': 'ryomen_sukuna', 'title': 'Ryomen Sukuna'},
+    ]
+
+    response = orders_rpc.list_orders_with_products()
+
+    assert len(response) == 1
+    details = response[0]['order_details']
+    assert details[0]['product'] == {
+        'id': 'satoro_goju', 'title': 'Satoro Goju'
+    }
+    assert details[1]['product'] == {
+        'id': 'ryomen_sukuna', 'title': 'Ryomen Sukuna'
+    }
+
+    (product_ids,), _ = orders_service.products_rpc.list.call_args
+    assert sorted(product_ids) == ['ryomen_sukuna', 'satoro_goju']
+
 def test_count_orders(orders_rpc, order):
     response = orders_rpc.count_orders()
     assert response == 1
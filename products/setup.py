@@ -10,6 +10,7 @@ setup(
     py_modules=['products'],
     install_requires=[
         "marshmallow==2.19.2",
+        "msgpack==1.0.4",
         "nameko==v3.0.0-rc6",
         "redis==3.2.1",
     ],